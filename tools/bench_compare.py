@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+#
+# Collect and compare physics pipeline benchmark results.
+#
+# `moon bench -p benchmarks` prints one JSON report per scene (see
+# benchmarks/report.mbt, `BenchReport::to_json`). This script:
+# - `collect`: extracts those lines from one or more log files into a results file.
+# - `compare`: compares two results files scene by scene and exits non-zero when a
+#   scene is slower by more than `--threshold` and the slowdown is statistically
+#   significant (one-sided Welch's t-test on the per-step batch times, `--alpha`).
+#
+# Usage:
+#   moon bench -p benchmarks > _build/bench.log
+#   python3 tools/bench_compare.py collect _build/bench.log -o _build/bench/new.json
+#   python3 tools/bench_compare.py compare baseline.json _build/bench/new.json
+#
+# Only the standard library is used.
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import pathlib
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+
+REPORT_PREFIX = '{"scene":'
+
+
+def _eprint(*args: object) -> None:
+    print(*args, file=sys.stderr)
+
+
+def parse_reports(lines: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """Scene name -> report for every JSON report line; later lines win."""
+    scenes: Dict[str, Dict[str, Any]] = {}
+    for line in lines:
+        line = line.strip()
+        if not line.startswith(REPORT_PREFIX):
+            continue
+        report = json.loads(line)
+        scenes[report["scene"]] = report
+    return scenes
+
+
+def step_times_ms(report: Dict[str, Any]) -> List[float]:
+    """Mean step time of each batch, in milliseconds."""
+    steps = max(int(report.get("steps_per_batch", 1)), 1)
+    return [float(ms) / steps for ms in report.get("batch_ms", [])]
+
+
+def _mean_var(xs: Sequence[float]) -> tuple[float, float]:
+    n = len(xs)
+    mean = sum(xs) / n
+    var = sum((x - mean) ** 2 for x in xs) / (n - 1) if n > 1 else 0.0
+    return mean, var
+
+
+def _betacf(a: float, b: float, x: float) -> float:
+    # Continued fraction for the regularized incomplete beta function (modified Lentz).
+    tiny = 1.0e-300
+    qab, qap, qam = a + b, a + 1.0, a - 1.0
+    c, d = 1.0, 1.0 - qab * x / qap
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    h = d
+    for m in range(1, 201):
+        m2 = 2 * m
+        aa = m * (b - m) * x / ((qam + m2) * (a + m2))
+        d = 1.0 + aa * d
+        d = 1.0 / (d if abs(d) > tiny else tiny)
+        c = 1.0 + aa / c
+        c = c if abs(c) > tiny else tiny
+        h *= d * c
+        aa = -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))
+        d = 1.0 + aa * d
+        d = 1.0 / (d if abs(d) > tiny else tiny)
+        c = 1.0 + aa / c
+        c = c if abs(c) > tiny else tiny
+        delta = d * c
+        h *= delta
+        if abs(delta - 1.0) < 1.0e-12:
+            break
+    return h
+
+
+def _betai(a: float, b: float, x: float) -> float:
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+    ln_front = (
+        math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log(1.0 - x)
+    )
+    front = math.exp(ln_front)
+    if x < (a + 1.0) / (a + b + 2.0):
+        return front * _betacf(a, b, x) / a
+    return 1.0 - front * _betacf(b, a, 1.0 - x) / b
+
+
+def student_t_sf(t: float, df: float) -> float:
+    """P(T > t) for Student's t distribution with `df` degrees of freedom."""
+    tail = 0.5 * _betai(0.5 * df, 0.5, df / (df + t * t))
+    return tail if t >= 0.0 else 1.0 - tail
+
+
+def welch_slower_p(base: Sequence[float], new: Sequence[float]) -> Optional[float]:
+    """One-sided p-value for "new is slower than base", or None with fewer than 2 samples each."""
+    if len(base) < 2 or len(new) < 2:
+        return None
+    mb, vb = _mean_var(base)
+    mn, vn = _mean_var(new)
+    sb, sn = vb / len(base), vn / len(new)
+    se2 = sb + sn
+    if se2 == 0.0:
+        # Identical samples on both sides: the difference is exact.
+        return 0.0 if mn > mb else 1.0
+    t = (mn - mb) / math.sqrt(se2)
+    df_den = (sb * sb) / (len(base) - 1) + (sn * sn) / (len(new) - 1)
+    df = se2 * se2 / df_den if df_den > 0.0 else float(len(base) + len(new) - 2)
+    return student_t_sf(t, df)
+
+
+def compare_scene(
+    base: Dict[str, Any],
+    new: Dict[str, Any],
+    threshold: float,
+    alpha: float,
+) -> Dict[str, Any]:
+    bt, nt = step_times_ms(base), step_times_ms(new)
+    base_ms = sum(bt) / len(bt) if bt else 0.0
+    new_ms = sum(nt) / len(nt) if nt else 0.0
+    change = (new_ms - base_ms) / base_ms if base_ms > 0.0 else 0.0
+    p = welch_slower_p(bt, nt)
+    regressed = change > threshold and p is not None and p < alpha
+    return {
+        "scene": base["scene"],
+        "base_ms": base_ms,
+        "new_ms": new_ms,
+        "change": change,
+        "p": p,
+        "regressed": regressed,
+    }
+
+
+def _load_results(path: pathlib.Path) -> Dict[str, Dict[str, Any]]:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return data["scenes"]
+
+
+def cmd_collect(args: argparse.Namespace) -> int:
+    scenes: Dict[str, Dict[str, Any]] = {}
+    for log in args.logs:
+        scenes.update(parse_reports(pathlib.Path(log).read_text(encoding="utf-8").splitlines()))
+    if not scenes:
+        _eprint("error: no benchmark report lines found")
+        return 2
+    out = pathlib.Path(args.output)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps({"scenes": scenes}, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    print(f"collected {len(scenes)} scenes into {out}")
+    return 0
+
+
+def cmd_compare(args: argparse.Namespace) -> int:
+    base = _load_results(pathlib.Path(args.base))
+    new = _load_results(pathlib.Path(args.new))
+    regressions = 0
+    print(f"{'scene':<14} {'base ms':>10} {'new ms':>10} {'change':>8} {'p':>8}")
+    for name in sorted(base):
+        if name not in new:
+            _eprint(f"warning: scene {name} missing from {args.new}")
+            continue
+        row = compare_scene(base[name], new[name], args.threshold, args.alpha)
+        p = "-" if row["p"] is None else f"{row['p']:.4f}"
+        mark = "  REGRESSION" if row["regressed"] else ""
+        print(
+            f"{name:<14} {row['base_ms']:>10.4f} {row['new_ms']:>10.4f} "
+            f"{row['change'] * 100.0:>7.1f}% {p:>8}{mark}"
+        )
+        if row["regressed"]:
+            regressions += 1
+    if regressions:
+        _eprint(f"error: {regressions} scene(s) regressed")
+        return 1
+    return 0
+
+
+def main(argv: Sequence[str]) -> int:
+    ap = argparse.ArgumentParser(description="Collect and compare physics pipeline benchmark results.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    colp = sub.add_parser("collect", help="Extract benchmark JSON report lines from moon bench logs.")
+    colp.add_argument("logs", nargs="+", help="moon bench output files.")
+    colp.add_argument("-o", "--output", required=True, help="Results file to write.")
+    colp.set_defaults(func=cmd_collect)
+
+    cmpp = sub.add_parser("compare", help="Fail on statistically significant slowdowns.")
+    cmpp.add_argument("base", help="Baseline results file.")
+    cmpp.add_argument("new", help="New results file.")
+    cmpp.add_argument(
+        "--threshold", type=float, default=0.05, help="Minimum relative slowdown to report (default: 0.05)."
+    )
+    cmpp.add_argument("--alpha", type=float, default=0.01, help="Significance level (default: 0.01).")
+    cmpp.set_defaults(func=cmd_compare)
+
+    args = ap.parse_args(argv)
+    return int(args.func(args))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
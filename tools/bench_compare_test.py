@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+#
+# Minimal regression tests for tools/bench_compare.py.
+#
+# Run:
+#   python3 tools/bench_compare_test.py
+#
+
+from __future__ import annotations
+
+import importlib.util
+import json
+import pathlib
+import tempfile
+
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+
+
+def _load_compare_module():
+    path = ROOT / "tools" / "bench_compare.py"
+    spec = importlib.util.spec_from_file_location("bench_compare", path)
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"failed to load module spec from {path}")
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def _report(scene: str, batch_ms: list[float]) -> str:
+    return json.dumps(
+        {
+            "scene": scene,
+            "bodies": 10,
+            "colliders": 10,
+            "steps_per_batch": 10,
+            "steps_per_sec": 0.0,
+            "batch_ms": batch_ms,
+            "stage_ms": {"step": 1.0},
+        },
+        separators=(",", ":"),
+    )
+
+
+def main() -> int:
+    bench = _load_compare_module()
+
+    # Student t survival function against known values.
+    assert abs(bench.student_t_sf(0.0, 5.0) - 0.5) < 1e-9, "t sf at 0"
+    assert abs(bench.student_t_sf(2.015, 5.0) - 0.05) < 1e-3, "t sf (df=5, 95%)"
+    assert abs(bench.student_t_sf(-2.015, 5.0) - 0.95) < 1e-3, "t sf negative t"
+
+    with tempfile.TemporaryDirectory() as td:
+        root = pathlib.Path(td)
+        base_log = root / "base.log"
+        new_log = root / "new.log"
+        base_log.write_text(
+            "running bench...\n"
+            + _report("pyramid", [10.0, 10.2, 9.9, 10.1, 10.0]) + "\n"
+            + _report("dominoes", [20.0, 20.5, 19.5, 20.2, 19.8]) + "\n"
+            + "bench: pyramid step  time (mean ± σ) ...\n",
+            encoding="utf-8",
+        )
+        new_log.write_text(
+            _report("pyramid", [12.0, 12.1, 11.9, 12.2, 12.0]) + "\n"
+            # Noisy but not meaningfully slower.
+            + _report("dominoes", [19.0, 22.0, 20.0, 21.0, 19.5]) + "\n",
+            encoding="utf-8",
+        )
+
+        assert bench.main(["collect", str(base_log), "-o", str(root / "base.json")]) == 0
+        assert bench.main(["collect", str(new_log), "-o", str(root / "new.json")]) == 0
+        collected = json.loads((root / "base.json").read_text(encoding="utf-8"))
+        assert sorted(collected["scenes"]) == ["dominoes", "pyramid"], "collect missed scenes"
+
+        scenes_base = collected["scenes"]
+        scenes_new = json.loads((root / "new.json").read_text(encoding="utf-8"))["scenes"]
+        row = bench.compare_scene(scenes_base["pyramid"], scenes_new["pyramid"], 0.05, 0.01)
+        assert row["regressed"], "a 20% consistent slowdown should regress"
+        row = bench.compare_scene(scenes_base["dominoes"], scenes_new["dominoes"], 0.05, 0.01)
+        assert not row["regressed"], "noise within the threshold should not regress"
+
+        # Results compared with themselves never regress.
+        assert bench.main(["compare", str(root / "base.json"), str(root / "base.json")]) == 0
+        assert bench.main(["compare", str(root / "base.json"), str(root / "new.json")]) == 1
+
+    print("ok")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
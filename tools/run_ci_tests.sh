@@ -20,6 +20,7 @@ cd "$ROOT"
 
 # Run all package tests except rapier_full to avoid default parity-test execution.
 moon test --frozen \
+  -p benchmarks \
   -p collision \
   -p control \
   -p core \
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+#
+# Tiered rapier_full_parity gate (MEDIUM / HEAVY / FULLSCALE profiles).
+#
+# Runs each gated scenario as its own `moon test --include-skipped -f FILE -F FILTER`
+# process, concurrently across cores, and enforces:
+# - a per-scenario budget on each process's own wall time (overruns are killed);
+# - a total budget on the wall time of the whole (parallel) run.
+#
+# Passing results are cached, keyed on a hash of the source trees of every package
+# rapier_full_parity depends on (plus the scenario, profile and `moon version`), so a
+# scenario is only re-run when code it can observe has changed. Every run appends one
+# JSON line with per-scenario timings to the history file so trends are visible.
+#
+# Each worker uses its own `--target-dir` so concurrent `moon` invocations do not
+# serialize on the build directory lock; the warmup builds every worker directory
+# up front and is excluded from the budgets.
+#
+# Usage:
+#   python3 tools/run_rapier_full_heavy_gate.py                 # HEAVY
+#   python3 tools/run_rapier_full_heavy_gate.py --profile fullscale
+#   python3 tools/run_rapier_full_heavy_gate.py --jobs 1 --no-cache
+#
+# Environment (same as the former shell gate):
+#   RAPIER_FULL_PROFILE, RAPIER_FULL_SCENARIO_BUDGET_SEC, RAPIER_FULL_TOTAL_BUDGET_SEC,
+#   RAPIER_FULL_SKIP_WARMUP=1, LOG_DIR (default: _build)
+#   RAPIER_FULL_JOBS (default: CPU count), RAPIER_FULL_NO_CACHE=1
+#
+# Outputs under LOG_DIR:
+#   rapier_full_heavy_gate.log                   combined moon output, one block per scenario
+#   rapier_full_heavy_gate/cache.json            passing results by cache key
+#   rapier_full_heavy_gate/history.jsonl         one JSON object per run
+
+from __future__ import annotations
+
+import argparse
+import concurrent.futures
+import datetime
+import hashlib
+import json
+import os
+import pathlib
+import re
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+PARITY_PKG = "rapier_full_parity"
+
+# Per-scenario and total budgets in seconds, by profile.
+BUDGETS: Dict[str, Tuple[float, float]] = {
+    "MEDIUM": (90.0, 180.0),
+    "HEAVY": (120.0, 300.0),
+    "FULLSCALE": (180.0, 360.0),
+}
+
+# (file, filter) pairs; `{P}` is replaced by the profile name.
+HEAVY_ONLY_SCENARIOS: List[Tuple[str, str]] = [
+    ("examples2d_s2d_pyramid_parity_test.mbt", "HEAVY examples2d/s2d_pyramid.rs*"),
+    ("examples3d_real_heightfield_parity_test.mbt", "HEAVY examples3d/heightfield3.rs*"),
+    ("examples3d_real_primitive_contacts_parity_test.mbt", "HEAVY examples3d/debug_cylinder3.rs*"),
+    ("examples3d_real_urdf_keva_voxels_parity_test.mbt", "HEAVY examples3d/voxels3.rs*"),
+]
+TIERED_SCENARIOS: List[Tuple[str, str]] = [
+    ("examples3d_trimesh_parity_test.mbt", "{P} examples3d/trimesh3.rs*"),
+    ("examples3d_worlds_parity_test.mbt", "{P} examples3d/domino3.rs*"),
+]
+
+
+def _eprint(*args: object) -> None:
+    print(*args, file=sys.stderr)
+
+
+def scenarios_for(profile: str) -> List[Tuple[str, str]]:
+    out = list(HEAVY_ONLY_SCENARIOS) if profile == "HEAVY" else []
+    out.extend((f, flt.replace("{P}", profile)) for f, flt in TIERED_SCENARIOS)
+    return out
+
+
+def _module_name(root: pathlib.Path) -> str:
+    m = re.search(r'^name\s*=\s*"([^"]+)"', (root / "moon.mod").read_text(encoding="utf-8"), re.M)
+    if m is None:
+        raise RuntimeError("moon.mod has no name")
+    return m.group(1)
+
+
+def package_closure(root: pathlib.Path, pkg: str) -> List[str]:
+    """`pkg` plus every package of this module it imports (including test imports), transitively."""
+    prefix = _module_name(root) + "/"
+    seen: Set[str] = set()
+    todo = [pkg]
+    while todo:
+        cur = todo.pop()
+        if cur in seen:
+            continue
+        seen.add(cur)
+        moon_pkg = root / cur / "moon.pkg"
+        if not moon_pkg.exists():
+            continue
+        for dep in re.findall(r'"([^"]+)"', moon_pkg.read_text(encoding="utf-8")):
+            if dep.startswith(prefix):
+                todo.append(dep[len(prefix) :])
+    return sorted(seen)
+
+
+def tree_hash(root: pathlib.Path, packages: Sequence[str]) -> str:
+    """Hash of the module manifest and every file of `packages` (paths and contents)."""
+    h = hashlib.sha256()
+    files = [root / "moon.mod"]
+    for pkg in packages:
+        pkg_dir = root / pkg
+        if pkg_dir.is_dir():
+            files.extend(p for p in pkg_dir.rglob("*") if p.is_file() and "_build" not in p.parts)
+    for path in sorted(files):
+        h.update(path.relative_to(root).as_posix().encode("utf-8"))
+        h.update(b"\0")
+        h.update(path.read_bytes())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def cache_key(tree: str, toolchain: str, profile: str, file: str, flt: str) -> str:
+    h = hashlib.sha256()
+    for part in (tree, toolchain, profile, file, flt):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def cached_pass(cache: Dict[str, Any], key: str, budget_sec: float) -> Optional[float]:
+    """Runtime of a cached pass that still fits `budget_sec`, or None."""
+    entry = cache.get(key)
+    if entry is None or float(entry["real_sec"]) > budget_sec:
+        return None
+    return float(entry["real_sec"])
+
+
+def _load_json(path: pathlib.Path) -> Dict[str, Any]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _toolchain_version() -> str:
+    try:
+        out = subprocess.run(["moon", "version"], capture_output=True, text=True, check=False)
+    except OSError:
+        return ""
+    return out.stdout.strip()
+
+
+def _git_rev(root: pathlib.Path) -> str:
+    out = subprocess.run(
+        ["git", "rev-parse", "HEAD"], cwd=root, capture_output=True, text=True, check=False
+    )
+    return out.stdout.strip()
+
+
+def _run_timed(cmd: Sequence[str], cwd: pathlib.Path, timeout: Optional[float]) -> Tuple[int, float, str, bool]:
+    """(exit code, wall seconds, combined output, timed out) of one process."""
+    start = time.monotonic()
+    proc = subprocess.Popen(cmd, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    try:
+        output, _ = proc.communicate(timeout=timeout)
+        timed_out = False
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        output, _ = proc.communicate()
+        timed_out = True
+    return proc.returncode, time.monotonic() - start, output or "", timed_out
+
+
+def main(argv: Sequence[str]) -> int:
+    ap = argparse.ArgumentParser(description="Run the tiered rapier_full_parity gate.")
+    ap.add_argument("--profile", default=os.environ.get("RAPIER_FULL_PROFILE", "heavy"), help="medium|heavy|fullscale")
+    ap.add_argument(
+        "--jobs",
+        type=int,
+        default=int(os.environ.get("RAPIER_FULL_JOBS", "0")) or (os.cpu_count() or 1),
+        help="Scenarios run concurrently (default: CPU count).",
+    )
+    ap.add_argument(
+        "--no-cache",
+        action="store_true",
+        default=os.environ.get("RAPIER_FULL_NO_CACHE", "0") == "1",
+        help="Re-run scenarios even when a passing result is cached.",
+    )
+    ap.add_argument(
+        "--skip-warmup",
+        action="store_true",
+        default=os.environ.get("RAPIER_FULL_SKIP_WARMUP", "0") == "1",
+        help="Skip the native release warmup build.",
+    )
+    ap.add_argument("--log-dir", default=os.environ.get("LOG_DIR", "_build"), help="Output directory (default: _build).")
+    args = ap.parse_args(argv)
+
+    log_dir = (ROOT / args.log_dir).resolve()
+    state_dir = log_dir / "rapier_full_heavy_gate"
+    state_dir.mkdir(parents=True, exist_ok=True)
+    log_file = log_dir / "rapier_full_heavy_gate.log"
+    log_lock = threading.Lock()
+    log_file.write_text("", encoding="utf-8")
+
+    def log(text: str) -> None:
+        with log_lock:
+            print(text, flush=True)
+            with log_file.open("a", encoding="utf-8") as f:
+                f.write(text + "\n")
+
+    profile = args.profile.upper()
+    if profile not in BUDGETS:
+        log(f"Unsupported RAPIER_FULL_PROFILE='{args.profile}'. Use medium|heavy|fullscale.")
+        return 1
+    scenario_budget, total_budget = BUDGETS[profile]
+    scenario_budget = float(os.environ.get("RAPIER_FULL_SCENARIO_BUDGET_SEC", scenario_budget))
+    total_budget = float(os.environ.get("RAPIER_FULL_TOTAL_BUDGET_SEC", total_budget))
+
+    scenarios = scenarios_for(profile)
+    jobs = max(1, min(args.jobs, len(scenarios)))
+    module = _module_name(ROOT)
+    toolchain = _toolchain_version()
+    tree = tree_hash(ROOT, package_closure(ROOT, PARITY_PKG))
+    cache_path = state_dir / "cache.json"
+    cache = {} if args.no_cache else _load_json(cache_path)
+
+    pending: List[Tuple[str, str, str]] = []
+    results: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for file, flt in scenarios:
+        key = cache_key(tree, toolchain, profile, file, flt)
+        hit = None if args.no_cache else cached_pass(cache, key, scenario_budget)
+        if hit is not None:
+            log(f"==> {profile} {file} ({flt}): cached pass ({hit:.2f}s)")
+            results[(file, flt)] = {"file": file, "filter": flt, "real_sec": hit, "cached": True, "status": "pass"}
+        else:
+            pending.append((file, flt, key))
+
+    target_dirs = [state_dir / f"target{i}" for i in range(jobs)]
+    if pending and not args.skip_warmup:
+        log(f"==> WARMUP native release build x{jobs} (excluded from runtime budget)")
+        warm = [
+            ["moon", "build", "--frozen", "--release", "--target", "native", "--target-dir", str(d), PARITY_PKG]
+            for d in target_dirs
+        ]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as pool:
+            for code, _, output, _ in pool.map(lambda c: _run_timed(c, ROOT, None), warm):
+                log(output.rstrip())
+                if code != 0:
+                    log("Warmup build failed")
+                    return 1
+
+    free_dirs = list(target_dirs)
+    dirs_lock = threading.Lock()
+
+    def run_scenario(file: str, flt: str, key: str) -> Dict[str, Any]:
+        with dirs_lock:
+            target_dir = free_dirs.pop()
+        try:
+            cmd = [
+                "moon", "test", "--frozen", "--release", "--target", "native", "--target-dir", str(target_dir),
+                "--include-skipped", "-p", f"{module}/{PARITY_PKG}", "-f", file, "-F", flt,
+            ]
+            # Let an overrun finish its budget plus a grace period, then kill it.
+            code, real_sec, output, timed_out = _run_timed(cmd, ROOT, scenario_budget + 5.0)
+        finally:
+            with dirs_lock:
+                free_dirs.append(target_dir)
+        if code != 0 or timed_out:
+            status = "fail"
+        elif real_sec > scenario_budget:
+            status = "over_budget"
+        else:
+            status = "pass"
+        log(f"==> {profile} {file} ({flt})\n{output.rstrip()}\nreal {real_sec:.2f}s [{status}]\n")
+        return {"file": file, "filter": flt, "real_sec": real_sec, "cached": False, "status": status, "key": key}
+
+    wall_start = time.monotonic()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(run_scenario, *p) for p in pending]
+        for fut in concurrent.futures.as_completed(futures):
+            r = fut.result()
+            results[(r["file"], r["filter"])] = r
+    wall_sec = time.monotonic() - wall_start
+
+    ok = True
+    for file, flt in scenarios:
+        r = results[(file, flt)]
+        if r["status"] == "fail":
+            log(f"Scenario failed: {file} ({flt})")
+            ok = False
+        elif r["status"] == "over_budget":
+            log(f"Runtime budget exceeded for {file}: real={r['real_sec']:.2f}s, budget={scenario_budget:.0f}s")
+            ok = False
+        elif not r["cached"]:
+            cache[r.pop("key")] = {"real_sec": r["real_sec"], "file": file, "filter": flt}
+    if wall_sec > total_budget:
+        log(f"Total runtime budget exceeded: total={wall_sec:.2f}s, budget={total_budget:.0f}s")
+        ok = False
+
+    cache_path.write_text(json.dumps(cache, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    history = {
+        "time": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "git_rev": _git_rev(ROOT),
+        "tree_hash": tree,
+        "profile": profile,
+        "jobs": jobs,
+        "wall_sec": round(wall_sec, 3),
+        "serial_sec": round(sum(r["real_sec"] for r in results.values() if not r["cached"]), 3),
+        "passed": ok,
+        "scenarios": [
+            {k: v for k, v in results[s].items() if k != "key"} | {"real_sec": round(results[s]["real_sec"], 3)}
+            for s in scenarios
+        ],
+    }
+    with (state_dir / "history.jsonl").open("a", encoding="utf-8") as f:
+        f.write(json.dumps(history, sort_keys=True) + "\n")
+
+    if not ok:
+        return 1
+    log(f"{profile}_GATE_DONE (wall {wall_sec:.2f}s, {jobs} jobs)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
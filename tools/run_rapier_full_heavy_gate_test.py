@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+#
+# Minimal regression tests for tools/run_rapier_full_heavy_gate.py caching helpers.
+#
+# Run:
+#   python3 tools/run_rapier_full_heavy_gate_test.py
+#
+
+from __future__ import annotations
+
+import importlib.util
+import pathlib
+import tempfile
+
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+
+
+def _load_gate_module():
+    path = ROOT / "tools" / "run_rapier_full_heavy_gate.py"
+    spec = importlib.util.spec_from_file_location("run_rapier_full_heavy_gate", path)
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"failed to load module spec from {path}")
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def main() -> int:
+    gate = _load_gate_module()
+
+    assert len(gate.scenarios_for("HEAVY")) == 6, "HEAVY runs the heavy-only and tiered scenarios"
+    assert gate.scenarios_for("FULLSCALE") == [
+        ("examples3d_trimesh_parity_test.mbt", "FULLSCALE examples3d/trimesh3.rs*"),
+        ("examples3d_worlds_parity_test.mbt", "FULLSCALE examples3d/domino3.rs*"),
+    ], "tiered filters use the profile name"
+
+    with tempfile.TemporaryDirectory() as td:
+        root = pathlib.Path(td)
+        (root / "moon.mod").write_text('name = "me/mod"\n', encoding="utf-8")
+        for pkg, imports in {
+            "parity": ['"me/mod/core"', '"moonbitlang/core/math"'],
+            "core": ['"me/mod/utils"'],
+            "utils": [],
+            "unrelated": [],
+        }.items():
+            (root / pkg).mkdir()
+            (root / pkg / "moon.pkg").write_text(
+                "import {\n" + "".join(f"  {i},\n" for i in imports) + "}\n", encoding="utf-8"
+            )
+            (root / pkg / "a.mbt").write_text(f"// {pkg}\n", encoding="utf-8")
+
+        closure = gate.package_closure(root, "parity")
+        assert closure == ["core", "parity", "utils"], f"unexpected closure {closure}"
+
+        before = gate.tree_hash(root, closure)
+        (root / "unrelated" / "a.mbt").write_text("// changed\n", encoding="utf-8")
+        assert gate.tree_hash(root, closure) == before, "unrelated packages must not affect the hash"
+        (root / "utils" / "a.mbt").write_text("// changed\n", encoding="utf-8")
+        after = gate.tree_hash(root, closure)
+        assert after != before, "dependency edits must change the hash"
+
+        key = gate.cache_key(after, "moon 0.1", "HEAVY", "f.mbt", "HEAVY x*")
+        assert key != gate.cache_key(after, "moon 0.1", "MEDIUM", "f.mbt", "HEAVY x*")
+        cache = {key: {"real_sec": 50.0}}
+        assert gate.cached_pass(cache, key, 120.0) == 50.0
+        assert gate.cached_pass(cache, key, 40.0) is None, "a cached pass must still fit the budget"
+        assert gate.cached_pass(cache, "missing", 120.0) is None
+
+    print("ok")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())